@@ -14,6 +14,11 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _model = joblib.load(os.path.join(BASE_DIR, "model.pkl"))
 _vectorizer = joblib.load(os.path.join(BASE_DIR, "vectorizer.pkl"))
 
+# float32 inference, same as the Milestone 1 API so both report identical scores
+_vectorizer.dtype = np.float32
+_model.coef_ = _model.coef_.astype(np.float32)
+_model.intercept_ = _model.intercept_.astype(np.float32)
+
 LABEL_MAP = {0: "Real News", 1: "Fake News"}
 CONFIDENCE_THRESHOLDS = {"high": 0.80, "medium": 0.65}
 
@@ -29,9 +34,10 @@ def predict(raw_text: str) -> dict:
     """
     cleaned = preprocess_text(raw_text)
     vector = _vectorizer.transform([cleaned])
-    pred_int = int(_model.predict(vector)[0])
     probs = _model.predict_proba(vector)[0]
-    confidence = float(np.max(probs))
+    best = int(np.argmax(probs))
+    pred_int = int(_model.classes_[best])
+    confidence = float(probs[best])
 
     # Confidence tier
     if confidence >= CONFIDENCE_THRESHOLDS["high"]:
@@ -13,13 +13,14 @@ load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from anyio import to_thread
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import io
 
-from scraper import extract_text_from_url
+from scraper import EMBEDDED_URL_RE, close_client, extract_text_from_url
 from preprocessing import validate_input_text
 from agent.predictor import predict
 from agent.risk_analyzer import analyze_risk
@@ -31,6 +32,7 @@ app = FastAPI(
     title="News Credibility Agentic AI API",
     description="Milestone 2 — Multi-step agentic credibility analysis with RAG + LLM report generation",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -42,27 +44,30 @@ app.add_middleware(
 )
 
 
+@app.on_event("shutdown")
+async def _close_http_client():
+    await close_client()
+
+
 class AnalyzeRequest(BaseModel):
     text: str = ""
     url: str = ""
 
 
-def _get_raw_text(request: AnalyzeRequest) -> tuple[str, str]:
+async def _get_raw_text(request: AnalyzeRequest) -> tuple[str, str]:
     """Extract raw text and source label from request."""
-    import re as _re
-
     if request.url.strip():
-        text = extract_text_from_url(request.url.strip())
+        text = await extract_text_from_url(request.url.strip())
         if not text:
             raise HTTPException(400, "Unable to extract article content from URL.")
         return text, "url"
 
     if request.text.strip():
         # Auto-detect URL embedded inside pasted text
-        url_match = _re.search(r'https?://[^\s]+', request.text.strip())
+        url_match = EMBEDDED_URL_RE.search(request.text.strip())
         if url_match:
             embedded_url = url_match.group(0).rstrip(')')
-            extracted = extract_text_from_url(embedded_url)
+            extracted = await extract_text_from_url(embedded_url)
             if extracted and len(extracted.split()) >= 80:
                 return extracted, "url"
         return request.text.strip(), "text"
@@ -99,13 +104,13 @@ def health():
 
 
 @app.post("/analyze")
-def analyze(request: AnalyzeRequest):
+async def analyze(request: AnalyzeRequest):
     """
     Full agentic credibility analysis.
     Returns structured JSON report with all pipeline metadata.
     """
-    raw_text, source = _get_raw_text(request)
-    state = _run_pipeline(raw_text)
+    raw_text, source = await _get_raw_text(request)
+    state = await to_thread.run_sync(_run_pipeline, raw_text)
 
     return {
         "status": "success",
@@ -143,19 +148,21 @@ def analyze(request: AnalyzeRequest):
 
 
 @app.post("/analyze/pdf")
-def analyze_pdf(request: AnalyzeRequest):
+async def analyze_pdf(request: AnalyzeRequest):
     """
     Same pipeline as /analyze but returns a downloadable PDF report.
     """
-    raw_text, _ = _get_raw_text(request)
-    state = _run_pipeline(raw_text)
+    raw_text, _ = await _get_raw_text(request)
+    state = await to_thread.run_sync(_run_pipeline, raw_text)
 
     try:
-        pdf_bytes = export_pdf(
-            report=state["report"],
-            prediction=state["prediction"],
-            risk_analysis=state["risk_analysis"],
-            raw_text=raw_text,
+        pdf_bytes = await to_thread.run_sync(
+            lambda: export_pdf(
+                report=state["report"],
+                prediction=state["prediction"],
+                risk_analysis=state["risk_analysis"],
+                raw_text=raw_text,
+            )
         )
     except ImportError:
         raise HTTPException(500, "reportlab not installed. Run: pip install reportlab")
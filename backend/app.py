@@ -1,14 +1,26 @@
 # app.py
 
+from anyio import to_thread
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from typing import List
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import joblib
+import math
+import multiprocessing
 import numpy as np
 import os
+import sys
+import threading
 
-from scraper import extract_text_from_url
-from preprocessing import preprocess_text, validate_input_text
+from agent.risk_analyzer import analyze_risk
+from model_arrays import EXPORTED_WEIGHTS_DIR, load_model_arrays
+from scraper import EMBEDDED_URL_RE, close_client, extract_text_from_url
+from preprocessing import PREPROCESS_CACHE_MAX_CHARS, preprocess_text, validate_input_text
 
 # ---------------------------
 # Initialize FastAPI App
@@ -16,7 +28,8 @@ from preprocessing import preprocess_text, validate_input_text
 app = FastAPI(
     title="AI News Credibility Analysis API",
     description="API for classifying news articles as Real or Fake using ML + NLP",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # C serializer, faster than stdlib json
 )
 
 # CORS (for Vite React frontend)
@@ -32,22 +45,195 @@ app.add_middleware(
 )
 
 # ---------------------------
-# Load Model & Vectorizer (ONCE at startup)
+# Load Model & Vectorizer (ONCE per worker, at startup)
 # ---------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
 VECTORIZER_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
 
-print("Loaded model from:", os.path.abspath(MODEL_PATH))
-print("Loaded vectorizer from:", os.path.abspath(VECTORIZER_PATH))
+LABEL_MAP = {
+    0: "Real News",
+    1: "Fake News"
+}
+
+# Upper bound on /predict_batch size (keeps one request's sparse matrix small)
+MAX_BATCH_SIZE = 256
+
+# Populated by _load_model() so that importing app.py (e.g. in the gunicorn
+# master) stays cheap and every worker process loads its own copy.
+# Either `scorer` (exported arrays, no sklearn) or `model` + `vectorizer`.
+scorer = None
+model = None
+vectorizer = None
+
+
+def _load_model():
+    global scorer, model, vectorizer
+
+    # Prefer the exported arrays (see model_arrays.py): weights are shared by
+    # all workers through the OS page cache and scored without scikit-learn.
+    # load_model_arrays refuses arrays exported from different pickles.
+    if os.path.isdir(EXPORTED_WEIGHTS_DIR):
+        try:
+            scorer = load_model_arrays(
+                EXPORTED_WEIGHTS_DIR, source_files=(MODEL_PATH, VECTORIZER_PATH)
+            )
+            print("✅ Model arrays memory-mapped from:", EXPORTED_WEIGHTS_DIR)
+            return
+        except Exception as e:
+            print(f"⚠️  Could not load model arrays ({e}), falling back to pickles")
+
+    print("Loading model from:", os.path.abspath(MODEL_PATH))
+    print("Loading vectorizer from:", os.path.abspath(VECTORIZER_PATH))
+
+    try:
+        model = joblib.load(MODEL_PATH)
+        vectorizer = joblib.load(VECTORIZER_PATH)
+        print("✅ Model and Vectorizer loaded successfully")
+    except Exception as e:
+        raise RuntimeError(f"Error loading model/vectorizer: {e}")
+
+    # Single-document inference gains nothing from float64: emit float32
+    # TF-IDF rows and keep the linear weights in float32 to match
+    vectorizer.dtype = np.float32
+    model.coef_ = model.coef_.astype(np.float32)
+    model.intercept_ = model.intercept_.astype(np.float32)
+
+
+# ---------------------------
+# Process pool for large /predict_batch requests
+# ---------------------------
+# Texts per sub-batch sent to a pool worker
+BATCH_CHUNK_SIZE = 64
+# Pool size. By default the CPUs are split between the WEB_CONCURRENCY server
+# workers (cpu_count // WEB_CONCURRENCY). gunicorn_conf.py always sets
+# WEB_CONCURRENCY, defaulting to one worker per CPU, where the pool is off.
+BATCH_WORKERS = int(os.getenv(
+    "BATCH_WORKERS",
+    max(1, (os.cpu_count() or 1) // int(os.getenv("WEB_CONCURRENCY", "1"))),
+))
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def _init_batch_worker():
+    """
+    Pool initializer. Under fork the parent's loaded model is inherited
+    (copy-on-write); under spawn the module is re-imported and loads it here.
+    """
+    if scorer is None and model is None:
+        _load_model()
+
+
+def _start_batch_executor(start_method=None):
+    global _batch_executor
+    # Never more processes than sub-batches in the largest allowed request
+    workers = min(BATCH_WORKERS, math.ceil(MAX_BATCH_SIZE / BATCH_CHUNK_SIZE))
+    if workers <= 1:
+        return
+
+    # fork shares the loaded model pages with the children on Linux; other
+    # platforms keep their default (spawn) start method
+    if start_method is None and sys.platform.startswith("linux"):
+        start_method = "fork"
+    ctx = multiprocessing.get_context(start_method)
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_batch_worker
+    )
+    # Start the workers now, before any request threads exist in this process
+    try:
+        executor.submit(int).result()
+    except Exception:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    _batch_executor = executor
+    print(f"✅ Batch process pool started ({workers} workers)")
+
+
+def _restart_batch_executor(broken):
+    """
+    Replace a pool broken by a dead worker (BrokenProcessPool). Request
+    threads exist by now, so the new workers are spawned rather than forked:
+    a fork could copy a lock another thread is holding.
+    """
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is not broken:
+            return  # already replaced by a concurrent request
+        broken.shutdown(wait=False, cancel_futures=True)
+        _batch_executor = None
+        try:
+            _start_batch_executor("spawn")
+        except Exception as e:
+            print(f"⚠️  Could not restart the batch process pool ({e}), scoring in-process")
+
+
+@app.on_event("startup")
+async def _startup():
+    _load_model()
+    _start_batch_executor()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _batch_executor is not None:
+        _batch_executor.shutdown(cancel_futures=True)
+    await close_client()
+
+
+# ---------------------------
+# TF-IDF vector cache (LRU, keyed on the cleaned text)
+# ---------------------------
+VECTOR_CACHE_SIZE = 1024
+_vector_cache: "OrderedDict[str, object]" = OrderedDict()
+_vector_cache_lock = threading.Lock()  # transform runs in worker threads
+
+
+def _vectorize(cleaned_text: str):
+    """vectorizer.transform for a single document, memoized for repeat inputs."""
+    if len(cleaned_text) >= PREPROCESS_CACHE_MAX_CHARS:
+        return vectorizer.transform([cleaned_text])
+
+    with _vector_cache_lock:
+        vector = _vector_cache.get(cleaned_text)
+        if vector is not None:
+            _vector_cache.move_to_end(cleaned_text)
+            return vector
+
+    vector = vectorizer.transform([cleaned_text])
+    with _vector_cache_lock:
+        _vector_cache[cleaned_text] = vector
+        if len(_vector_cache) > VECTOR_CACHE_SIZE:
+            _vector_cache.popitem(last=False)
+    return vector
+
+
+def _predict_proba(cleaned_texts: List[str]):
+    """
+    Class probabilities (n_texts x n_classes) for preprocessed texts.
+    Blocking and CPU-bound — call through to_thread from async handlers.
+    """
+    if scorer is not None:
+        return scorer.predict_proba(cleaned_texts)
+    if len(cleaned_texts) == 1:
+        return model.predict_proba(_vectorize(cleaned_texts[0]))
+    return model.predict_proba(vectorizer.transform(cleaned_texts))
+
+
+def _classes():
+    return scorer.classes_ if scorer is not None else model.classes_
+
+
+def _looks_credible(raw_text: str) -> bool:
+    """
+    Heuristic half of the "uncertain" flag (same rule as agent_app's /analyze):
+    a Fake verdict on text with credibility markers and low risk is uncertain.
+    """
+    risk = analyze_risk(raw_text)
+    return risk.get("credibility_hits", 0) >= 2 and risk.get("risk_score", 0) <= 20
 
-try:
-    model = joblib.load(MODEL_PATH)
-    vectorizer = joblib.load(VECTORIZER_PATH)
-    print("✅ Model and Vectorizer loaded successfully")
-except Exception as e:
-    raise RuntimeError(f"Error loading model/vectorizer: {e}")
 
 # ---------------------------
 # Request Schema (Input Format)
@@ -57,6 +243,10 @@ class NewsRequest(BaseModel):
     url: str = ""
 
 
+class BatchRequest(BaseModel):
+    texts: List[str]
+
+
 # ---------------------------
 # Root Endpoint (Health Check)
 # ---------------------------
@@ -72,7 +262,7 @@ def home():
 # Main Prediction Endpoint
 # ---------------------------
 @app.post("/predict")
-def predict_news(request: NewsRequest):
+async def predict_news(request: NewsRequest):
     """
     Predict whether a news article is Real or Fake
     based on:
@@ -87,7 +277,7 @@ def predict_news(request: NewsRequest):
         # Step 1: Get Text (URL or Direct)
         # ---------------------------
         if user_url:
-            extracted_text = extract_text_from_url(user_url)
+            extracted_text = await extract_text_from_url(user_url)
 
             if not extracted_text:
                 raise HTTPException(
@@ -100,11 +290,10 @@ def predict_news(request: NewsRequest):
 
         elif user_text:
             # Auto-detect URL embedded inside pasted text
-            import re as _re
-            url_match = _re.search(r'https?://[^\s]+', user_text)
+            url_match = EMBEDDED_URL_RE.search(user_text)
             if url_match:
                 embedded_url = url_match.group(0).rstrip(')')
-                extracted = extract_text_from_url(embedded_url)
+                extracted = await extract_text_from_url(embedded_url)
                 if extracted and len(extracted.split()) >= 80:
                     raw_text = extracted
                     source = "url"
@@ -133,7 +322,7 @@ def predict_news(request: NewsRequest):
         # ---------------------------
         # Step 3: Preprocess Text (SAME as training pipeline)
         # ---------------------------
-        cleaned_text = preprocess_text(raw_text)
+        cleaned_text = await to_thread.run_sync(preprocess_text, raw_text)
         print(cleaned_text)
         if not cleaned_text:
             raise HTTPException(
@@ -142,16 +331,14 @@ def predict_news(request: NewsRequest):
             )
 
         # ---------------------------
-        # Step 4: Vectorize using SAVED TF-IDF
-        # ---------------------------
-        vector = vectorizer.transform([cleaned_text])
-        print(vector)
+        # Step 4-5: Vectorize using SAVED TF-IDF + Model Prediction
         # ---------------------------
-        # Step 5: Model Prediction (FIXED ORDER)
-        # ---------------------------
-        prediction = model.predict(vector)[0]
-        probabilities = model.predict_proba(vector)[0]
-        confidence = float(np.max(probabilities))
+        # Probabilities only — predict() would recompute the same decision
+        # function, so the label is derived from the probabilities instead
+        probabilities = (await to_thread.run_sync(_predict_proba, [cleaned_text]))[0]
+        best = int(np.argmax(probabilities))
+        prediction = _classes()[best]
+        confidence = float(probabilities[best])
 
         print("Raw prediction:", prediction)
         print("Probabilities:", probabilities)
@@ -160,22 +347,14 @@ def predict_news(request: NewsRequest):
         # ---------------------------
         # Step 6: Label Mapping
         # ---------------------------
-        label_map = {
-            0: "Real News",
-            1: "Fake News"
-        }
-        predicted_label = label_map.get(int(prediction), str(prediction))
+        predicted_label = LABEL_MAP.get(int(prediction), str(prediction))
 
         # ---------------------------
         # Step 7: Uncertain check (model confidence + heuristic override)
         # ---------------------------
-        from agent.risk_analyzer import analyze_risk
-        risk = analyze_risk(raw_text)
-        credibility_hits = risk.get("credibility_hits", 0)
-        risk_score = risk.get("risk_score", 0)
         uncertain = confidence < 0.80
         # Override: if model says Fake but heuristics show credible content → uncertain
-        if predicted_label == "Fake News" and credibility_hits >= 2 and risk_score <= 20:
+        if predicted_label == "Fake News" and await to_thread.run_sync(_looks_credible, raw_text):
             uncertain = True
 
         # ---------------------------
@@ -207,4 +386,112 @@ def predict_news(request: NewsRequest):
         raise
     except Exception as e:
         print("🔥 INTERNAL SERVER ERROR:", str(e))
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ---------------------------
+# Batch Prediction Endpoint
+# ---------------------------
+def _predict_batch(texts: List[str]):
+    """
+    Preprocess, vectorize and classify many texts at once.
+    One vectorizer.transform + one predict_proba over all rows is far cheaper
+    than N single-document calls.
+    Returns per-row flags rather than the cleaned texts, so that pool workers
+    don't send every article back over the pipe.
+    """
+    cleaned = [preprocess_text(t) for t in texts]
+    probabilities = _predict_proba(cleaned)
+    empty = [not c for c in cleaned]
+    # The credibility heuristic only matters for Fake verdicts and costs more
+    # than the model itself, so skip it for every other row
+    classes = _classes()
+    credible = [
+        not is_empty
+        and LABEL_MAP.get(int(classes[best]), str(classes[best])) == "Fake News"
+        and _looks_credible(text)
+        for text, is_empty, best in zip(texts, empty, probabilities.argmax(axis=1))
+    ]
+    return empty, probabilities, credible
+
+
+def _predict_batch_parallel(texts: List[str]):
+    """
+    _predict_batch over BATCH_CHUNK_SIZE sub-batches in the process pool,
+    so large batches use every core instead of one GIL-bound thread.
+    """
+    executor = _batch_executor
+    if executor is None or len(texts) <= BATCH_CHUNK_SIZE:
+        return _predict_batch(texts)
+
+    chunks = [texts[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(texts), BATCH_CHUNK_SIZE)]
+    try:
+        chunk_results = list(executor.map(_predict_batch, chunks))
+    except BrokenProcessPool:
+        print("⚠️  Batch process pool broken, scoring in-process and restarting it")
+        _restart_batch_executor(executor)
+        return _predict_batch(texts)
+
+    empty, probabilities, credible = [], [], []
+    for chunk_empty, chunk_probabilities, chunk_credible in chunk_results:
+        empty.extend(chunk_empty)
+        probabilities.append(chunk_probabilities)
+        credible.extend(chunk_credible)
+    return empty, np.vstack(probabilities), credible
+
+
+@app.post("/predict_batch")
+async def predict_batch(request: BatchRequest):
+    """
+    Predict Real/Fake for a list of news texts (no URL scraping).
+    Returns one result per input text, in the same order.
+    """
+    texts = [t.strip() for t in request.texts]
+    if not texts:
+        raise HTTPException(status_code=400, detail="Please provide at least one news text.")
+    if len(texts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many texts in one batch (maximum {MAX_BATCH_SIZE})."
+        )
+
+    try:
+        results = [
+            {"status": "error", "detail": "Input text is too short or invalid for analysis."}
+            for _ in texts
+        ]
+        valid = [i for i, t in enumerate(texts) if validate_input_text(t)]
+        if not valid:
+            return {"status": "success", "results": results}
+
+        empty, probabilities, credible = await to_thread.run_sync(
+            _predict_batch_parallel, [texts[i] for i in valid]
+        )
+        best = probabilities.argmax(axis=1)
+
+        for row, i in enumerate(valid):
+            if empty[row]:
+                results[i] = {
+                    "status": "error",
+                    "detail": "Text preprocessing resulted in empty content."
+                }
+                continue
+            prediction = _classes()[best[row]]
+            predicted_label = LABEL_MAP.get(int(prediction), str(prediction))
+            confidence = float(probabilities[row, best[row]])
+            word_count = len(texts[i].split())
+            results[i] = {
+                "status": "success",
+                "prediction": predicted_label,
+                "confidence_score": round(confidence * 100, 2),
+                "word_count": word_count,
+                "reliable": word_count >= 80,
+                # Same rule as /predict: low confidence, or Fake on credible-looking text
+                "uncertain": confidence < 0.80 or (predicted_label == "Fake News" and credible[row]),
+            }
+
+        return {"status": "success", "results": results}
+
+    except Exception as e:
+        print("🔥 INTERNAL SERVER ERROR:", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
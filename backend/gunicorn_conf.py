@@ -0,0 +1,25 @@
+"""
+gunicorn_conf.py — production server config for the Milestone 1 API.
+
+Runs app.py under several Uvicorn workers so CPU-bound inference is not
+serialized on one core by the GIL. Each worker loads its own model copy in
+the FastAPI startup hook.
+
+Usage (from backend/):
+    gunicorn -c gunicorn_conf.py app:app
+
+Environment:
+    WEB_CONCURRENCY  number of worker processes (default: CPU count)
+    PORT             port to bind on 0.0.0.0 (default: 8000)
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+# Exported so app.py (imported by the forked workers) sizes its batch pool
+# from the same worker count, including when WEB_CONCURRENCY is unset
+os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+workers = int(os.environ["WEB_CONCURRENCY"])
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Scraping a slow news site can take a while; don't kill the worker mid-request
+timeout = 60
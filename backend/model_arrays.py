@@ -0,0 +1,233 @@
+"""
+model_arrays.py — memory-mapped model weights + sklearn-free inference scorer.
+
+Every gunicorn/uvicorn worker that joblib.load()s model.pkl + vectorizer.pkl
+holds a private copy of the weights. Exporting the numeric arrays to .npy
+files and opening them with mmap_mode='r' lets the OS page cache back all
+workers with the same physical pages.
+
+At inference time TF-IDF + Logistic Regression is just
+    sigmoid(b + sum_j coef[j] * tfidf[j])
+so TfidfLinearScorer computes that directly from the exported arrays, without
+building a CSR matrix or going through scikit-learn.
+
+One-time export (run from backend/ after retraining):
+    python3 model_arrays.py
+
+app.py picks the arrays up automatically when exported_weights/ exists and
+falls back to the pickles otherwise — including when model.pkl or
+vectorizer.pkl has changed since the export (checked by SHA-256).
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional — falls back to the numpy implementation
+    njit = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXPORTED_WEIGHTS_DIR = os.path.join(BASE_DIR, "exported_weights")
+MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
+VECTORIZER_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
+
+# sklearn's default word tokenizer; on preprocess_text output (only [a-z ])
+# it is equivalent to "split on spaces, keep tokens of 2+ letters"
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def _score_sorted_indices(indices, idf, coef, binary, sublinear_tf, l2_norm):
+    """
+    Per-token scoring loop: one pass over the sorted feature indices,
+    accumulating coef . tfidf and the squared norm. Written as plain loops so
+    Numba can compile it to native code.
+    """
+    dot = 0.0
+    sq_norm = 0.0
+    n = indices.shape[0]
+    i = 0
+    while i < n:
+        j = i + 1
+        while j < n and indices[j] == indices[i]:
+            j += 1
+        tf = 1.0 if binary else float(j - i)
+        if sublinear_tf:
+            tf = 1.0 + np.log(tf)
+        weight = tf * idf[indices[i]]
+        dot += coef[indices[i]] * weight
+        sq_norm += weight * weight
+        i = j
+    if l2_norm and sq_norm > 0.0:
+        dot /= np.sqrt(sq_norm)
+    return dot
+
+
+_score_kernel = njit(cache=True)(_score_sorted_indices) if njit is not None else None
+
+
+class TfidfLinearScorer:
+    """
+    sklearn-free replacement for vectorizer.transform + model.predict_proba.
+    Reproduces TfidfVectorizer (word n-grams, stop words, sublinear tf, idf,
+    l2 norm) followed by binary LogisticRegression, for texts that have
+    already been through preprocess_text.
+    """
+
+    def __init__(self, vocabulary, idf, coef, intercept, classes, params):
+        if (params["analyzer"] != "word"
+                or params.get("tokenizer") is not None
+                or params.get("preprocessor") is not None
+                or params.get("strip_accents") is not None
+                or params["token_pattern"] != DEFAULT_TOKEN_PATTERN
+                or not params["use_idf"]
+                or params["norm"] not in ("l2", None)):
+            raise ValueError("Vectorizer configuration not supported by the inline scorer")
+
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.coef = coef.ravel()
+        self.intercept = float(intercept[0])
+        self.classes_ = classes
+        self.stop_words = frozenset(params["stop_words"] or ())
+        self.min_n, self.max_n = params["ngram_range"]
+        self.binary = params["binary"]
+        self.sublinear_tf = params["sublinear_tf"]
+        self.norm = params["norm"]
+        self.lowercase = params["lowercase"]
+
+        # Compile the Numba kernel now rather than on the first request
+        if _score_kernel is not None:
+            self.score_indices(np.zeros(1, dtype=np.int64))
+
+    def feature_indices(self, doc: str) -> np.ndarray:
+        """Vocabulary indices of every n-gram in doc (with repeats)."""
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = [t for t in doc.split() if len(t) > 1 and t not in self.stop_words]
+
+        # Same n-gram construction as sklearn's _word_ngrams
+        terms = tokens if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n, len(tokens)) + 1):
+            terms = terms + [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+
+        get = self.vocabulary.get
+        return np.fromiter(
+            (i for i in map(get, terms) if i is not None), dtype=np.int64
+        )
+
+    def score_indices(self, indices: np.ndarray) -> float:
+        """Linear part of the logit for one document's feature indices."""
+        if indices.size == 0:
+            return 0.0
+        if _score_kernel is not None:
+            return _score_kernel(
+                np.sort(indices), self.idf, self.coef,
+                self.binary, self.sublinear_tf, self.norm == "l2",
+            )
+        indices, counts = np.unique(indices, return_counts=True)
+        tf = np.ones(len(counts)) if self.binary else counts.astype(np.float64)
+        if self.sublinear_tf:
+            tf = 1.0 + np.log(tf)
+        weights = tf * self.idf[indices]
+        dot = float(np.dot(self.coef[indices], weights))
+        if self.norm == "l2":
+            dot /= float(np.sqrt(np.dot(weights, weights)))
+        return dot
+
+    def decision_function(self, docs) -> np.ndarray:
+        return np.array(
+            [self.score_indices(self.feature_indices(d)) for d in docs]
+        ) + self.intercept
+
+    def predict_proba(self, docs) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(docs)))
+        return np.column_stack([1.0 - positive, positive])
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_hashes(source_files) -> dict:
+    return {os.path.basename(p): _file_sha256(p) for p in source_files}
+
+
+def export_model_arrays(model, vectorizer, out_dir: str = EXPORTED_WEIGHTS_DIR,
+                        source_files=(MODEL_PATH, VECTORIZER_PATH)) -> None:
+    """
+    Write the weights of a fitted binary LogisticRegression + TfidfVectorizer.
+    source_files are the pickles model/vectorizer were loaded from; their
+    hashes are recorded so load_model_arrays can detect a stale export.
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary classifiers can be exported")
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "coef.npy"), model.coef_.astype(np.float32))
+    np.save(os.path.join(out_dir, "intercept.npy"), model.intercept_.astype(np.float32))
+    np.save(os.path.join(out_dir, "classes.npy"), model.classes_)
+    np.save(os.path.join(out_dir, "idf.npy"), vectorizer.idf_)
+
+    with open(os.path.join(out_dir, "vocab.json"), "w") as f:
+        json.dump({term: int(i) for term, i in vectorizer.vocabulary_.items()}, f)
+
+    # Everything the analyzer needs to tokenize exactly as during training.
+    # Fails loudly if the vectorizer uses a custom (non-JSON) tokenizer.
+    params = {
+        k: v for k, v in vectorizer.get_params().items()
+        if k not in ("dtype", "vocabulary", "stop_words")
+    }
+    stop_words = vectorizer.get_stop_words()
+    params["stop_words"] = sorted(stop_words) if stop_words else None
+    params["source_sha256"] = _source_hashes(source_files)
+    with open(os.path.join(out_dir, "vectorizer_params.json"), "w") as f:
+        json.dump(params, f, indent=2)
+
+
+def load_model_arrays(in_dir: str = EXPORTED_WEIGHTS_DIR,
+                      source_files=(MODEL_PATH, VECTORIZER_PATH)) -> TfidfLinearScorer:
+    """
+    Build a TfidfLinearScorer from exported arrays.
+    Weight arrays are memory-mapped read-only; only the vocabulary dict is
+    materialized per process.
+    Raises ValueError if source_files no longer match the hashes recorded at
+    export time (the pickles were retrained and the arrays not re-exported).
+    """
+    def _load(name):
+        return np.asarray(np.load(os.path.join(in_dir, name), mmap_mode="r"))
+
+    with open(os.path.join(in_dir, "vocab.json")) as f:
+        vocabulary = json.load(f)
+    with open(os.path.join(in_dir, "vectorizer_params.json")) as f:
+        params = json.load(f)
+
+    if params.pop("source_sha256", None) != _source_hashes(source_files):
+        raise ValueError(
+            "exported weights do not match the current pickles; "
+            "re-run python3 model_arrays.py"
+        )
+
+    return TfidfLinearScorer(
+        vocabulary=vocabulary,
+        idf=_load("idf.npy"),
+        coef=_load("coef.npy"),
+        intercept=_load("intercept.npy"),
+        classes=np.load(os.path.join(in_dir, "classes.npy")),
+        params=params,
+    )
+
+
+if __name__ == "__main__":
+    import joblib
+
+    model = joblib.load(MODEL_PATH)
+    vectorizer = joblib.load(VECTORIZER_PATH)
+    export_model_arrays(model, vectorizer)
+    print(f"✅ Exported model arrays to {EXPORTED_WEIGHTS_DIR}")
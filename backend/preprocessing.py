@@ -1,35 +1,62 @@
-import re
-import nltk
+from functools import lru_cache
+
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
-# Download only once (safe)
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+# NLTK data is installed at build/setup time (render.yaml buildCommand, README),
+# never downloaded from a running server. Fail fast at import if it is missing.
+# Immutable, built once at import and shared by every request/thread.
+try:
+    STOP_WORDS = frozenset(stopwords.words('english'))
+except LookupError as e:
+    raise RuntimeError(
+        "NLTK 'stopwords' corpus not found. Install it with: "
+        "python -m nltk.downloader stopwords"
+    ) from e
+
+# Byte table for a single C-level cleaning pass: lowercase ASCII letters are
+# kept, every other byte becomes a space. Applied after lower() and an ASCII
+# encode (non-ASCII -> '?'), so it matches re.sub(r'[^a-zA-Z\s]', ' ', ...);
+# runs of spaces are collapsed by the split() that follows.
+_ALPHA_TABLE = bytes(c if 97 <= c <= 122 else 0x20 for c in range(256))
+
+
+def remove_stopwords(text: str) -> str:
+    # Text is already reduced to [a-z ] by preprocess_text, so tokenizing is a
+    # plain whitespace split (no Punkt/Treebank tokenizer needed)
+    # A compiled stopword alternation (re.sub) was benchmarked against this
+    # and lost at every input size (~11x slower plain, ~2.4x as a trie regex),
+    # so the frozenset lookup stays.
+    return " ".join([word for word in text.split() if word not in STOP_WORDS])
+
+
+# Repeated inputs (retries, dashboards, the same URL scraped twice) skip the
+# cleaning pass. Inputs of MAX_CHARS or more are not cached, so keys and
+# values together stay under 2 * CACHE_SIZE * MAX_CHARS characters (~32 MB of
+# ASCII per process); typical articles are well under the threshold.
+PREPROCESS_CACHE_SIZE = 1024
+PREPROCESS_CACHE_MAX_CHARS = 16_000
 
-stop_words = set(stopwords.words('english'))
 
 def preprocess_text(text: str) -> str:
     if not text:
         return ""
+    if len(text) < PREPROCESS_CACHE_MAX_CHARS:
+        return _preprocess_cached(text)
+    return _preprocess(text)
 
-    # 1. Lowercase (same as training)
-    text = text.lower()
-
-    # 2. Remove punctuation & special characters (same regex as notebook)
-    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
 
-    # 3. Remove extra spaces (same as notebook)
-    text = re.sub(r'\s+', ' ', text).strip()
+def _preprocess(text: str) -> str:
+    # 1-2. Lowercase + remove punctuation & special characters
+    #      (same result as the [^a-zA-Z\s] regex the current model was trained with)
+    text = text.lower().encode('ascii', 'replace').translate(_ALPHA_TABLE).decode('ascii')
 
-    # 4. Tokenize (same as training)
-    words = word_tokenize(text)
+    # 3-5. Remove extra spaces, tokenize + remove stopwords (split() does both)
+    # 6. Return cleaned_content EXACTLY like training column
+    return remove_stopwords(text)
 
-    # 5. Remove stopwords (same logic as notebook)
-    filtered_words = [word for word in words if word not in stop_words]
 
-    # 6. Return cleaned_content EXACTLY like training column
-    return " ".join(filtered_words)
+# preprocess_text is pure (str -> str), so memoizing it is safe
+_preprocess_cached = lru_cache(maxsize=PREPROCESS_CACHE_SIZE)(_preprocess)
 
 
 def validate_input_text(text: str) -> bool:
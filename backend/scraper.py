@@ -1,13 +1,22 @@
 """
 scraper.py — Robust article extractor.
 Strategy:
-  1. newspaper3k (fast, handles most sites)
-  2. BeautifulSoup fallback (handles paywalled/JS-blocked sites like TOI, NYT, etc.)
+  0. Fetch the page ONCE (async, pooled httpx.AsyncClient with browser headers)
+  1. newspaper3k parses the fetched HTML (fast, handles most sites)
+  2. BeautifulSoup fallback on the same HTML (handles sites like TOI, NYT, etc.)
   3. Returns empty string if both fail
 """
-import requests
+import re
+
+import httpx
+from anyio import fail_after, to_thread
 from bs4 import BeautifulSoup
 
+try:
+    from newspaper import Article, Config
+except ImportError:  # newspaper3k missing — BeautifulSoup fallback still works
+    Article = Config = None
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -18,6 +27,50 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.5",
 }
 
+# Seconds. httpx applies its timeout per connect/read, so _fetch_html also
+# puts an overall deadline on the whole download (slow-drip servers).
+FETCH_TIMEOUT = 15
+
+# Matches a URL pasted inside free text (compiled once, used per request)
+EMBEDDED_URL_RE = re.compile(r'https?://\S+')
+
+# Stop reading a page after this many bytes. Article text sits well inside
+# the first MiB even on script-heavy pages; the cap bounds bandwidth, parse
+# time and memory on huge or never-ending responses.
+MAX_HTML_BYTES = 1024 * 1024
+
+# Shared newspaper3k config: we only need title + body text, so skip image
+# downloads, memoization and per-article language detection.
+NEWSPAPER_CONFIG = None
+if Config is not None:
+    NEWSPAPER_CONFIG = Config()
+    NEWSPAPER_CONFIG.fetch_images = False
+    NEWSPAPER_CONFIG.memoize_articles = False
+    NEWSPAPER_CONFIG.language = "en"
+    NEWSPAPER_CONFIG.number_threads = 1
+    NEWSPAPER_CONFIG.browser_user_agent = HEADERS["User-Agent"]
+    NEWSPAPER_CONFIG.request_timeout = FETCH_TIMEOUT
+
+# One pooled async client per process: keep-alive connections (HTTP/2 where
+# the site supports it) are reused across requests, and the event loop can
+# overlap many concurrent scrapes. Created on first use and closed by the
+# apps' shutdown hooks; run.py serves both apps from one process, so a
+# client closed by one app's shutdown is simply recreated for the other.
+_client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
 # Ordered list of CSS selectors to try for article body extraction
 ARTICLE_SELECTORS = [
     "article",
@@ -45,12 +98,45 @@ ARTICLE_SELECTORS = [
 ]
 
 
-def _extract_with_newspaper(url: str) -> str:
-    """Try newspaper3k extraction."""
+async def _fetch_html(url: str) -> str:
+    """
+    Download the page once (streamed, capped at MAX_HTML_BYTES);
+    both extractors parse this same HTML.
+    """
+    try:
+        with fail_after(FETCH_TIMEOUT):
+            async with _get_client().stream("GET", url) as resp:
+                if resp.status_code != 200:
+                    print(f"[scraper] HTTP {resp.status_code} for {url}")
+                    return ""
+
+                buf = bytearray()
+                async for chunk in resp.aiter_bytes():
+                    buf += chunk
+                    if len(buf) >= MAX_HTML_BYTES:
+                        print(f"[scraper] truncated at {MAX_HTML_BYTES} bytes: {url}")
+                        break
+                encoding = resp.charset_encoding or "utf-8"
+    except TimeoutError:
+        print(f"[scraper] fetch timed out after {FETCH_TIMEOUT}s: {url}")
+        return ""
+    except httpx.HTTPError as e:
+        print(f"[scraper] fetch error: {e}")
+        return ""
+
     try:
-        from newspaper import Article
-        article = Article(url)
-        article.download()
+        return bytes(buf[:MAX_HTML_BYTES]).decode(encoding, errors="replace")
+    except LookupError:  # unknown charset in the Content-Type header
+        return bytes(buf[:MAX_HTML_BYTES]).decode("utf-8", errors="replace")
+
+
+def _extract_with_newspaper(url: str, html: str) -> str:
+    """Try newspaper3k extraction on already-downloaded HTML."""
+    if Article is None:
+        return ""
+    try:
+        article = Article(url, config=NEWSPAPER_CONFIG)
+        article.download(input_html=html)
         article.parse()
         title = article.title or ""
         body = article.text or ""
@@ -60,14 +146,10 @@ def _extract_with_newspaper(url: str) -> str:
         return ""
 
 
-def _extract_with_bs4(url: str) -> str:
+def _extract_with_bs4(html: str) -> str:
     """BeautifulSoup fallback — tries multiple selectors."""
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15)
-        if resp.status_code != 200:
-            return ""
-
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(html, "html.parser")
 
         # Remove noise elements
         for tag in soup(["script", "style", "nav", "footer", "header",
@@ -109,24 +191,17 @@ def _extract_with_bs4(url: str) -> str:
         return ""
 
 
-def extract_text_from_url(url: str) -> str:
-    """
-    Extract article text from a URL.
-    Tries newspaper3k first, falls back to BeautifulSoup.
-    Returns empty string if both fail.
-    """
-    if not url or not isinstance(url, str):
-        return ""
-
+def _extract_from_html(url: str, html: str) -> str:
+    """Run newspaper3k, then the BeautifulSoup fallback, on fetched HTML."""
     # Strategy 1: newspaper3k
-    text = _extract_with_newspaper(url)
+    text = _extract_with_newspaper(url, html)
     if len(text.split()) >= 80:
         print(f"[scraper] newspaper3k: {len(text.split())} words")
         return text
 
     # Strategy 2: BeautifulSoup
     print(f"[scraper] newspaper3k got {len(text.split())} words, trying BS4 fallback...")
-    text_bs4 = _extract_with_bs4(url)
+    text_bs4 = _extract_with_bs4(html)
     if len(text_bs4.split()) >= len(text.split()):
         print(f"[scraper] BS4: {len(text_bs4.split())} words")
         return text_bs4
@@ -135,6 +210,31 @@ def extract_text_from_url(url: str) -> str:
     return text  # return whatever we have, even if short
 
 
+async def extract_text_from_url(url: str) -> str:
+    """
+    Extract article text from a URL.
+    Downloads the page once, tries newspaper3k first, falls back to BeautifulSoup.
+    Returns empty string if both fail.
+    """
+    if not url or not isinstance(url, str):
+        return ""
+
+    html = await _fetch_html(url)
+    if not html:
+        return ""
+
+    # HTML parsing is CPU-bound — keep it off the event loop
+    return await to_thread.run_sync(_extract_from_html, url, html)
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (call from the app's shutdown hook)."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
 def is_valid_news_content(text: str) -> bool:
     if not text:
         return False
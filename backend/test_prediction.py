@@ -8,15 +8,20 @@ Or from project root:
     python3 backend/test_prediction.py
 """
 
+import copy
 import os
 import sys
+import tempfile
 import joblib
+import numpy as np
 
 # Allow running from project root OR backend/
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
 from preprocessing import preprocess_text
+import model_arrays
+from model_arrays import export_model_arrays, load_model_arrays
 
 MODEL_PATH = os.path.join(BASE_DIR, "model.pkl")
 VECTORIZER_PATH = os.path.join(BASE_DIR, "vectorizer.pkl")
@@ -31,15 +36,32 @@ print(f"  Vectorizer: {type(vec).__name__} | vocab size: {len(vec.vocabulary_)}"
 
 # ─── Test 1: Benchmark on saved test set ─────────────────────────────────────
 print("\n─── Test 1: Accuracy on saved X_test ───")
-X_test = joblib.load(X_TEST_PATH)
-y_test = joblib.load(Y_TEST_PATH)
-
-X_vec = vec.transform(X_test)
-preds = model.predict(X_vec)
-acc = sum(p == t for p, t in zip(preds, y_test)) / len(y_test)
-print(f"  Accuracy: {acc:.2%} on {len(y_test)} samples")
-assert acc > 0.90, f"Accuracy too low! Expected >90%, got {acc:.2%}"
-print("  ✅ PASSED")
+accuracy_checked = False
+if os.path.exists(X_TEST_PATH) and os.path.exists(Y_TEST_PATH):
+    X_test = joblib.load(X_TEST_PATH)
+    y_test = joblib.load(Y_TEST_PATH)
+
+    X_vec = vec.transform(X_test)
+    preds = model.predict(X_vec)
+    acc = sum(p == t for p, t in zip(preds, y_test)) / len(y_test)
+    print(f"  Accuracy: {acc:.2%} on {len(y_test)} samples")
+    assert acc > 0.90, f"Accuracy too low! Expected >90%, got {acc:.2%}"
+    print("  ✅ PASSED")
+    accuracy_checked = True
+else:
+    # artifacts/ is produced by notebook 03 from the (LFS) dataset. Without
+    # it the accuracy gate cannot run, which fails the script (see the end).
+    # Tests 4 and 5 only compare inference paths, so they still run on
+    # documents built from the fitted vocabulary.
+    print("  ❌ NOT RUN — artifacts/X_test.pkl not found (run notebook 03 first)")
+    rng = np.random.default_rng(0)
+    terms = vec.get_feature_names_out()
+    X_test = [
+        " ".join(rng.choice(terms, size=rng.integers(5, 300)))
+        for _ in range(2000)
+    ]
+    print(f"  Tests 4-5 use {len(X_test)} documents sampled from the vocabulary")
+    preds = model.predict(vec.transform(X_test))
 
 # ─── Test 2: Real-world fake news ────────────────────────────────────────────
 print("\n─── Test 2: Real-world fake news snippet ───")
@@ -75,4 +97,48 @@ print(f"  Prediction : {label}")
 print(f"  Confidence : {max(prob) * 100:.1f}%")
 print(f"  ✅ PASSED" if pred == 0 else "  ⚠️  Expected Real News")
 
+# ─── Test 4: float32 inference matches float64 ───────────────────────────────
+print("\n─── Test 4: float32 inference (as served by app.py) ───")
+vec32 = copy.deepcopy(vec)
+vec32.dtype = np.float32
+model32 = copy.deepcopy(model)
+model32.coef_ = model32.coef_.astype(np.float32)
+model32.intercept_ = model32.intercept_.astype(np.float32)
+preds32 = model32.predict(vec32.transform(X_test))
+mismatches = int(np.sum(preds32 != preds))
+print(f"  Label mismatches vs float64: {mismatches} / {len(X_test)}")
+assert mismatches == 0, f"float32 changed {mismatches} predictions"
+print("  ✅ PASSED")
+
+# ─── Test 5: sklearn-free scorer matches vectorizer + model ──────────────────
+print("\n─── Test 5: inline TF-IDF scorer (model_arrays.py) ───")
+with tempfile.TemporaryDirectory() as tmp:
+    export_model_arrays(model, vec, tmp)
+    scorer = load_model_arrays(tmp)
+sample = list(X_test[:2000])
+expected = model.predict_proba(vec.transform(sample))
+
+# Check the Numba kernel (when installed) and the numpy fallback
+kernels = [("numpy", None)]
+if model_arrays._score_kernel is not None:
+    kernels.insert(0, ("numba", model_arrays._score_kernel))
+else:
+    print("  numba not installed — only the numpy path is checked")
+for name, kernel in kernels:
+    saved, model_arrays._score_kernel = model_arrays._score_kernel, kernel
+    try:
+        got = scorer.predict_proba(sample)
+    finally:
+        model_arrays._score_kernel = saved
+    max_diff = float(np.abs(expected - got).max())
+    label_mismatches = int(np.sum(expected.argmax(axis=1) != got.argmax(axis=1)))
+    print(f"  [{name}] Max probability difference: {max_diff:.2e}")
+    print(f"  [{name}] Label mismatches: {label_mismatches} / {len(sample)}")
+    assert max_diff < 1e-4 and label_mismatches == 0, f"Inline scorer ({name}) diverges from sklearn"
+print("  ✅ PASSED")
+
+if not accuracy_checked:
+    print("\n❌ Test 1 (accuracy) did not run — missing artifacts/X_test.pkl")
+    sys.exit(1)
+
 print("\n✅ All tests complete.")